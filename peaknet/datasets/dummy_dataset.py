@@ -21,49 +21,63 @@ class DummyImageDataConfig:
     H          : int
     W          : int
     sample_size: int
+    cache_size : int = 1
 
 
 class DummyImageData(Dataset):
     def __init__(self, config):
-        self.config = config
+        self.config      = config
+        self.sample_size = config.sample_size
+
+        # Generate a small pool of random samples once, so fetching a sample
+        # is a view into the pool rather than a fresh call to the RNG
+        C = config.C
+        H = config.H
+        W = config.W
+        self.cache_size  = config.cache_size
+        self.input_cache = torch.empty(self.cache_size, C, H, W).normal_()
+        self.label_cache = torch.empty(self.cache_size, C, H, W).normal_()
 
     def __getitem__(self, idx):
-        C           = self.config.C
-        H           = self.config.H
-        W           = self.config.W
-        sample_size = self.config.sample_size
-        adds_label  = self.config.adds_label
+        cache_idx = idx % self.cache_size
 
-        input = torch.randn(C, H, W)
-        label = torch.randn(C, H, W)
+        input = self.input_cache[cache_idx]
+        label = self.label_cache[cache_idx]
 
         return input, label
 
     def __len__(self):
-        return self.config.sample_size
+        return self.sample_size
 
 
 @dataclass
 class DistributedSegmentedDummyImageDataConfig:
-    C              : int
-    H              : int
-    W              : int
-    seg_size       : int
-    total_size     : int
-    dist_rank      : int
-    dist_world_size: int
-    transforms     : Union[None, List, Tuple]
-    dtype          : torch.dtype
+    C                  : int
+    H                  : int
+    W                  : int
+    seg_size           : int
+    total_size         : int
+    dist_rank          : int
+    dist_world_size    : int
+    transforms         : Union[None, List, Tuple]
+    dtype              : torch.dtype
+    generates_on_device: bool = False
 
 
 class DistributedSegmentedDummyImageData(Dataset):
     def __init__(self, config):
         self.config = config
 
-        self.total_size = config.total_size
-        self.seg_size   = config.seg_size
-        self.transforms = config.transforms
-        self.dtype      = config.dtype
+        self.C               = config.C
+        self.H               = config.H
+        self.W               = config.W
+        self.total_size      = config.total_size
+        self.seg_size        = config.seg_size
+        self.dist_rank       = config.dist_rank
+        self.dist_world_size = config.dist_world_size
+        self.transforms      = config.transforms
+        self.dtype           = config.dtype
+        self.generates_on_device = config.generates_on_device
 
         self.start_idx   = 0
         self.end_idx     = 0
@@ -76,20 +90,24 @@ class DistributedSegmentedDummyImageData(Dataset):
 
     @property
     def num_seg(self):
-        return ceil(self.config.total_size / (self.config.seg_size * self.config.dist_world_size))
+        return ceil(self.total_size / (self.seg_size * self.dist_world_size))
 
     def __getitem__(self, idx):
         global_idx = self.current_dataset[idx]
 
-        ## logger.debug(f"[RANK {self.config.dist_rank}] DATA IDX = {global_idx}")
-        ## print(f"[RANK {self.config.dist_rank}] DATA IDX = {global_idx}")
+        ## logger.debug(f"[RANK {self.dist_rank}] DATA IDX = {global_idx}")
+        ## print(f"[RANK {self.dist_rank}] DATA IDX = {global_idx}")
+
+        # Defer data generation to generate_batch_on_device???
+        if self.generates_on_device:
+            return global_idx
 
-        C = self.config.C
-        H = self.config.H
-        W = self.config.W
+        C = self.C
+        H = self.H
+        W = self.W
 
         input = torch.randn(C, H, W)
-        label = torch.randn(C, H, W) > 0.5
+        label = torch.empty(C, H, W, dtype = torch.bool).random_()    # Uniform bits, no Gaussian sampling
 
         # Apply transformation to input and label at the same time...
         if self.transforms is not None:
@@ -106,6 +124,37 @@ class DistributedSegmentedDummyImageData(Dataset):
 
         return input, label
 
+    def generate_batch_on_device(self, batch, device):
+        """
+        Generate a batch of dummy data directly on `device`.
+
+        Works with `generates_on_device`, where a batch from the DataLoader
+        only carries global indices, so no image data is copied from host
+        to device.
+        """
+        B = len(batch)
+        C = self.C
+        H = self.H
+        W = self.W
+
+        input = torch.randn(B, C, H, W, device = device)
+        label = torch.empty(B, C, H, W, dtype = torch.bool, device = device).random_()
+
+        # Apply transformation to input and label at the same time...
+        if self.transforms is not None:
+            data = torch.cat([input, label], dim = 0)    # (2*B, C, H, W)
+            if self.dtype is not None: data = data.to(self.dtype)
+            for enum_idx, trans in enumerate(self.transforms):
+                data = trans(data)
+
+            input = data[:B]    # (B, C, H, W)
+            label = data[B:]    # (B, C, H, W)
+
+        # Binarize the label...
+        label = label > 0
+
+        return input, label
+
     def __len__(self):
         return self.end_idx - self.start_idx
 
@@ -114,36 +163,28 @@ class DistributedSegmentedDummyImageData(Dataset):
         end_idx is not inclusive (up to, but not including end_idx)
         """
         # Calculate and return the end index for the current dataset segment.
-        return min(self.start_idx + self.config.seg_size * self.config.dist_world_size, self.config.total_size)
+        return min(self.start_idx + self.seg_size * self.dist_world_size, self.total_size)
 
     def update_dataset_segment(self):
-        logger.debug(f"[RANK {self.config.dist_rank}] Updating segment to {self.start_idx}-{self.end_idx}.")
-        return list(range(self.start_idx, self.end_idx))
+        logger.debug(f"[RANK {self.dist_rank}] Updating segment to {self.start_idx}-{self.end_idx}.")
+        return range(self.start_idx, self.end_idx)
 
     def set_start_idx(self, start_idx):
-        requires_reset = False
+        logger.debug(f"[RANK {self.dist_rank}] Setting start idx to {start_idx}.")
 
-        logger.debug(f"[RANK {self.config.dist_rank}] Setting start idx to {start_idx}.")
+        # Reset if reached the end of the dataset???
+        if start_idx >= self.total_size:
+            self.reset()
+            return True
 
         self.start_idx = start_idx
         self.end_idx   = self.calculate_end_idx()
 
-        # Update dataset segment and sync across ranks
-        object_list = [None,]  # For communication
-        if self.config.dist_rank == 0:
-            self.current_dataset = self.update_dataset_segment()
-            object_list = [self.current_dataset,]
-
-        if self.config.dist_world_size > 1:
-            logger.debug(f"[RANK {self.config.dist_rank}] Syncing current dataset.")
-            dist.broadcast_object_list(object_list, src = 0)
-            self.current_dataset = object_list[0]
-
-        # Reset if reached the end of the item generator???
-        if len(self.current_dataset) == 0:
-            requires_reset = True
-            self.reset()
+        # Update dataset segment
+        # The segment only depends on (start_idx, end_idx), so every rank
+        # derives it locally and no broadcast is needed
+        self.current_dataset = self.update_dataset_segment()
 
-        return requires_reset
+        return False
 
 
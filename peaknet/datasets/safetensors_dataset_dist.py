@@ -1,4 +1,5 @@
 import csv
+import json
 
 from safetensors.torch import load_file
 from collections import deque
@@ -13,7 +14,6 @@ import warnings
 from dataclasses import dataclass
 from typing import Optional, List
 
-from ..utils_fsdp import broadcast_dict
 from ..perf import Timer
 
 @dataclass
@@ -55,23 +55,32 @@ class DistributedSegmentedDataset(Dataset):
     def save_checkpoint(self, checkpoint_path, rank):
         if rank == 0:
             checkpoint = {
-                'end_idx'       : self.end_idx,
-                'micro_batch_size_per_rank': self.micro_batch_size_per_rank
+                'end_idx'       : int(self.end_idx),
+                'micro_batch_size_per_rank': int(self.micro_batch_size_per_rank)
             }
-            torch.save(checkpoint, checkpoint_path)
+            with open(checkpoint_path, 'w') as fh:
+                json.dump(checkpoint, fh)
         dist.barrier()
 
     def load_checkpoint_and_broadcast(self, checkpoint_path, rank, device):
-        checkpoint = None
+        # Only two ints are needed, so send them as one tensor instead of a pickled dict
+        checkpoint_tensor = torch.zeros(2, dtype = torch.long, device = device)
         if rank == 0:
-            checkpoint = torch.load(checkpoint_path)
-        checkpoint = broadcast_dict(checkpoint, src=0, device=device)
-
-        if checkpoint:
-            self.set_start_idx(checkpoint.get('end_idx', 0))
-            if 'micro_batch_size_per_rank' in checkpoint and checkpoint['micro_batch_size_per_rank'] != self.micro_batch_size_per_rank:
-                warnings.warn(f"micro_batch_size_per_rank has been changed from {checkpoint['micro_batch_size_per_rank']} to {self.micro_batch_size_per_rank}. Resetting to {checkpoint['micro_batch_size_per_rank']}.")
-                self.micro_batch_size_per_rank = checkpoint['micro_batch_size_per_rank']
+            try:
+                with open(checkpoint_path, 'r') as fh:
+                    checkpoint = json.load(fh)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                # Fall back to checkpoints saved by torch.save
+                checkpoint = torch.load(checkpoint_path)
+            checkpoint_tensor[0] = checkpoint.get('end_idx', 0)
+            checkpoint_tensor[1] = checkpoint.get('micro_batch_size_per_rank', self.micro_batch_size_per_rank)
+        dist.broadcast(checkpoint_tensor, src = 0)
+
+        end_idx, micro_batch_size_per_rank = checkpoint_tensor.tolist()
+        self.set_start_idx(end_idx)
+        if micro_batch_size_per_rank != self.micro_batch_size_per_rank:
+            warnings.warn(f"micro_batch_size_per_rank has been changed from {micro_batch_size_per_rank} to {self.micro_batch_size_per_rank}. Resetting to {micro_batch_size_per_rank}.")
+            self.micro_batch_size_per_rank = micro_batch_size_per_rank
 
         dist.barrier()
 
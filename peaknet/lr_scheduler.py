@@ -1,6 +1,6 @@
 from torch.optim.lr_scheduler import _LRScheduler
 
-import math
+import numpy as np
 
 class CosineLRScheduler(_LRScheduler):
     """ Iteration can mean an epoch, a micro batch or a mini batch.
@@ -13,6 +13,15 @@ class CosineLRScheduler(_LRScheduler):
         self.decay_iterations  = self.total_iterations - self.warmup_iterations
         self.last_iteration    = last_iteration
         self.base_lrs          = [group['lr'] for group in self.optimizer.param_groups]
+        self.cosine_decay      = self.build_cosine_decay()
+
+    def build_cosine_decay(self):
+        """
+        Precompute the cosine decay multiplier for every iteration in the decay
+        phase so that `get_lr` only performs a lookup.
+        """
+        decay_ratio = np.linspace(0, 1, max(self.decay_iterations, 0) + 1)
+        return 0.5 * (1 + np.cos(np.pi * decay_ratio))
 
     def get_lr(self):
         """
@@ -30,8 +39,7 @@ class CosineLRScheduler(_LRScheduler):
             return [self.min_lr]
 
         # Cosine decay...
-        decay_ratio = (self.last_iteration - self.warmup_iterations) / self.decay_iterations
-        cosine_decay = 0.5 * (1 + math.cos(math.pi * decay_ratio))
+        cosine_decay = float(self.cosine_decay[self.last_iteration - self.warmup_iterations])
         return [self.min_lr + (base_lr - self.min_lr) * cosine_decay for base_lr in self.base_lrs]
 
     def sync_with_optimizer(self, new_lrs):
@@ -65,3 +73,5 @@ class CosineLRScheduler(_LRScheduler):
         self.total_iterations  = state_dict['total_iterations']
         self.min_lr            = state_dict['min_lr']
         self.base_lrs          = state_dict['base_lrs']
+        self.decay_iterations  = self.total_iterations - self.warmup_iterations
+        self.cosine_decay      = self.build_cosine_decay()
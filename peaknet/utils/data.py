@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+def move_to_device(batch, device, non_blocking = True):
+    """
+    Recursively move tensors in a batch (tensor, list, tuple or dict) to the
+    device.  Anything that is not a tensor, e.g. a None batch, is returned as
+    is.
+    """
+    if torch.is_tensor(batch):
+        return batch.to(device, non_blocking = non_blocking)
+
+    if isinstance(batch, (list, tuple)):
+        return type(batch)(move_to_device(x, device, non_blocking) for x in batch)
+
+    if isinstance(batch, dict):
+        return { k : move_to_device(v, device, non_blocking) for k, v in batch.items() }
+
+    return batch
+
+
+def record_stream(batch, stream):
+    """
+    Mark tensors in a batch as used by the stream so that the caching
+    allocator does not reuse their memory before the stream is done with them.
+    """
+    if torch.is_tensor(batch):
+        batch.record_stream(stream)
+
+    elif isinstance(batch, (list, tuple)):
+        for x in batch:
+            record_stream(x, stream)
+
+    elif isinstance(batch, dict):
+        for v in batch.values():
+            record_stream(v, stream)
+
+
+def prefetch_to_device(dataloader, device):
+    """
+    Iterate over a dataloader while copying the next batch to the device on a
+    side CUDA stream, so the host-to-device transfer overlaps with the compute
+    on the current batch.
+
+    The copy is only asynchronous when the dataloader uses pinned memory.  On
+    non-CUDA devices the batches are yielded unchanged.
+
+    Usage:
+        for batch_idx, batch_data in enumerate(prefetch_to_device(dataloader, device)):
+            ...
+    """
+    device = torch.device(device)
+    if device.type != 'cuda':
+        yield from dataloader
+        return
+
+    stream = torch.cuda.Stream(device = device)
+
+    data_iter = iter(dataloader)
+    try:
+        batch = next(data_iter)
+    except StopIteration:
+        return
+
+    with torch.cuda.stream(stream):
+        next_batch = move_to_device(batch, device)
+
+    for batch in data_iter:
+        # Wait for the copy of the batch to be consumed...
+        current_stream = torch.cuda.current_stream(device)
+        current_stream.wait_stream(stream)
+        record_stream(next_batch, current_stream)
+        curr_batch = next_batch
+
+        # Launch the copy of the next batch...
+        with torch.cuda.stream(stream):
+            next_batch = move_to_device(batch, device)
+
+        yield curr_batch
+
+    current_stream = torch.cuda.current_stream(device)
+    current_stream.wait_stream(stream)
+    record_stream(next_batch, current_stream)
+    yield next_batch
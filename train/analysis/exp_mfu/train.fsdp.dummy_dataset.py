@@ -451,6 +451,7 @@ C            = input_config.get('C')
 H            = input_config.get('H')
 W            = input_config.get('W')
 total_size   = input_config.get('total_size')
+generates_on_device = input_config.get('generates_on_device', False)
 dataset_train_config = DistributedSegmentedDummyImageDataConfig(
     C               = C,
     H               = H,
@@ -461,6 +462,7 @@ dataset_train_config = DistributedSegmentedDummyImageDataConfig(
     dist_world_size = dist_world_size,
     transforms      = pre_transforms,
     dtype           = None,
+    generates_on_device = generates_on_device,
 )
 dataset_train = DistributedSegmentedDummyImageData(dataset_train_config)
 
@@ -470,7 +472,7 @@ dataset_eval_train = DistributedSegmentedDummyImageData(dataset_train_config)
 
 # --- For val loss
 dataset_eval_val_config = DistributedSegmentedDummyImageDataConfig(
-    C, H, W, seg_size, total_size, dist_rank, dist_world_size, pre_transforms, None,
+    C, H, W, seg_size, total_size, dist_rank, dist_world_size, pre_transforms, None, generates_on_device,
 )
 dataset_eval_val = DistributedSegmentedDummyImageData(dataset_eval_val_config)
 
@@ -772,6 +774,10 @@ def estimate_loss(
             none_mask[enum_idx] = 1
             batch_data = (batch_input, batch_target)
 
+        # Generate dummy data on GPUs when the dataloader only yields indices
+        elif generates_on_device:
+            batch_data = dataloader.dataset.generate_batch_on_device(batch_data, device)
+
         # -- Optional batch data transforms on GPUs to improve mfu
         # Concat data to perform the identical transform on input and target
         batch_data = torch.cat(batch_data, dim = 0)    # (2*B, C, H, W)
@@ -1169,6 +1175,10 @@ try:
                     batch_target = torch.zeros(batch_input_shape, dtype = mixed_precision_dtype)
                     batch_data = (batch_input, batch_target)
 
+                # Generate dummy data on GPUs when the dataloader only yields indices
+                elif generates_on_device:
+                    batch_data = dataset_train.generate_batch_on_device(batch_data, device)
+
                 # ----- Optional batch data transforms on GPUs to improve mfu
                 # Concat data to perform the identical transform on input and target
                 batch_data = torch.cat(batch_data, dim = 0)    # (2*B, C, H, W)
@@ -66,6 +66,7 @@ from peaknet.criterion import CategoricalFocalLoss
 # --- Others
 from peaknet.utils.seed        import set_seed
 from peaknet.utils.misc        import is_action_due
+from peaknet.utils.data        import prefetch_to_device
 from peaknet.utils.checkpoint  import Checkpoint
 from peaknet.lr_scheduler      import CosineLRScheduler
 from peaknet.perf              import Timer
@@ -756,7 +757,7 @@ def estimate_loss(
     num_samples = torch.zeros(len(dataloader), device = device)
     proc_masks  = torch.zeros(len(dataloader), device = device)  # A mask to track the process
     none_mask   = torch.zeros(len(dataloader), device = device)  # Mask for None batches
-    for enum_idx, batch_data in tqdm.tqdm(enumerate(dataloader), total = max_iter, desc = f'[RANK {dist_rank}] Eval{desc}'):    # (B, C, H, W)
+    for enum_idx, batch_data in tqdm.tqdm(enumerate(prefetch_to_device(dataloader, device)), total = max_iter, desc = f'[RANK {dist_rank}] Eval{desc}'):    # (B, C, H, W)
         # Sample at most max_iter batches
         if enum_idx >= max_iter: break
 
@@ -1150,7 +1151,7 @@ try:
             # --- Mini batch loop
             logger.debug(f"[RANK {dist_rank}] Start processing {len(dataloader)} batches at epoch {epoch}, seg {seg}.")
             for batch_idx, batch_data in tqdm.tqdm(
-                enumerate(dataloader),
+                enumerate(prefetch_to_device(dataloader, device)),
                 total = num_batches,
                 desc  = f'[RANK {dist_rank}] Mini batch',
             ):